@@ -12,6 +12,8 @@ use std::thread;
 
 pub const MAX_FLIGHT_STREAM_POINTS: usize = 10_000;
 pub const MAX_CHANNEL_STREAM_POINTS: usize = 100;
+// Messages queued on the ZMQ socket before streaming scripts block or drop
+const ZMQ_RCVHWM: i32 = 100;
 
 #[derive(Clone)]
 pub enum StreamPoint {
@@ -130,6 +132,11 @@ impl StreamManager {
                 debug!("Failed to set receive timeout: {:?}", e);
             }
 
+            // Keep the receive queue short so a backlog can't delay what is shown
+            if let Err(e) = subscriber.set_rcvhwm(ZMQ_RCVHWM) {
+                debug!("Failed to set receive high water mark: {:?}", e);
+            }
+
             debug!("Connecting to tcp://localhost:5555");
 
             if let Err(e) = subscriber.connect("tcp://localhost:5555") {
@@ -181,9 +188,10 @@ impl StreamManager {
                         if e != zmq::Error::EAGAIN {
                             debug!("ZMQ receive error: {:?}", e);
                         }
+                        // Only wait when the queue is empty, so queued messages drain
+                        std::thread::sleep(std::time::Duration::from_millis(10));
                     }
                 }
-                std::thread::sleep(std::time::Duration::from_millis(10));
             }
         });
 
@@ -10,6 +10,9 @@ def echo_two(state):
     print("Echo Two!")
     print(f"App state: {state}")
 
+# Functions that can be run individually with --function
+HANDLERS = {fn.__name__: fn for fn in (echo_one, echo_two)}
+
 if __name__ == "__main__":
     # Parse arguments to check for function-specific execution
     parser = argparse.ArgumentParser()
@@ -21,8 +24,9 @@ if __name__ == "__main__":
     
     if args.function:
         # Execute specific function if requested
-        if args.function in globals():
-            globals()[args.function](state)
+        handler = HANDLERS.get(args.function)
+        if handler:
+            handler(state)
         else:
             print(f"Error: Function '{args.function}' not found")
     else:
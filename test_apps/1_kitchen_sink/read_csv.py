@@ -1,50 +1,41 @@
-import pandas as pd
-import json
+import polars as pl
+import orjson
 import sys
-import os
 from pathlib import Path
 
-def replace_file_name(path, new_file_name):
-    directory = os.path.dirname(path)
-    return os.path.join(directory, new_file_name)
-
-def convert_to_serializable(val):
-    if pd.isna(val):
-        return ""
-    if isinstance(val, float):
-        return str(val)
-    return str(val)
-
-script_path = os.path.abspath(__file__)
+script_path = Path(__file__).resolve()
 print(f"DEBUG: Script location: {script_path}", file=sys.stderr, flush=True)
 
-file_path = replace_file_name(script_path, "penguins.csv")
+file_path = script_path.parent / "penguins.csv"
 
-print(f"DEBUG: Looking for file: {os.path.abspath(file_path)}", file=sys.stderr, flush=True)
+print(f"DEBUG: Looking for file: {file_path}", file=sys.stderr, flush=True)
 
 try:
     # Check if file exists first
-    if not Path(file_path).exists():
-        print(f"DEBUG: File not found at: {os.path.abspath(file_path)}", file=sys.stderr, flush=True)
-        print(json.dumps({
+    if not file_path.is_file():
+        print(f"DEBUG: File not found at: {file_path}", file=sys.stderr, flush=True)
+        print(orjson.dumps({
             "error": f"File not found: {file_path}"
-        }))
+        }).decode())
         sys.exit(1)
         
     # Read the CSV file
-    df = pd.read_csv(file_path)
+    df = pl.read_csv(file_path)
+
+    # Render every cell as a string, with missing values as empty strings
+    df = df.select(pl.all().cast(pl.Utf8).fill_null(""))
     
     # Convert DataFrame to JSON format
     json_data = {
-        "columns": df.columns.tolist(),
-        "data": [[convert_to_serializable(val) for val in row] for row in df.values.tolist()]
+        "columns": df.columns,
+        "data": df.rows()
     }
     
-    print(json.dumps(json_data))
+    print(orjson.dumps(json_data).decode())
 except Exception as e:
     print(f"DEBUG: Error occurred: {str(e)}", file=sys.stderr, flush=True)
-    print(json.dumps({
+    print(orjson.dumps({
         "error": str(e)
-    }))
+    }).decode())
 
 
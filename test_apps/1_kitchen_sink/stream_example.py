@@ -3,6 +3,28 @@ import time
 import numpy as np
 import sys
 import json
+import orjson
+
+SAMPLES_PER_BATCH = 1024  # Sine samples generated per vectorized call
+TIME_STEP = 0.1  # Timestamp increment between samples
+SEND_PERIOD = 0.01  # Seconds between sent samples
+SEND_HWM = 16  # Samples queued for the app before new samples are dropped
+
+def fill_samples(timestamps, values, offsets, t_base, frequency, y_offset):
+    # Write the next batch into the preallocated buffers without allocating
+    np.add(offsets, t_base, out=timestamps)
+    np.multiply(timestamps, frequency, out=values)
+    np.sin(values, out=values)
+    values += y_offset
+
+def sleep_until(deadline):
+    # Sleep until a fixed-period deadline so send time does not accumulate as
+    # drift, restarting the schedule from now if it has already passed
+    delay = deadline - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+        return deadline
+    return time.perf_counter()
 
 def stream_data():
     print("Starting stream_example.py", flush=True)
@@ -21,23 +43,35 @@ def stream_data():
     
     # Data streaming socket
     socket = context.socket(zmq.PUSH)
+    socket.setsockopt(zmq.IMMEDIATE, 1)  # Only queue for connected peers
+    socket.setsockopt(zmq.SNDHWM, SEND_HWM)  # Drop samples beyond a short send queue
     print("Creating ZMQ PUSH socket...", flush=True)
     socket.bind("tcp://*:5555")
     print("Bound ZMQ socket to tcp://*:5555", flush=True)
 
     try:
-        t = 0
+        offsets = np.arange(SAMPLES_PER_BATCH) * TIME_STEP
+        timestamps = np.empty(SAMPLES_PER_BATCH)
+        values = np.empty(SAMPLES_PER_BATCH)
+        t_base = 0.0
+        next_send = time.perf_counter()
         while True:
-            value = np.sin(t * frequency) + y_offset
-            
-            data = {
-                "stream_id": "sine_wave",
-                "timestamp": float(t),
-                "value": float(value)
-            }
-            socket.send_string(json.dumps(data))
-            t += 0.1
-            time.sleep(0.01)  # Add a small delay
+            # Generate a batch of samples with vectorized calls, then pace them out
+            fill_samples(timestamps, values, offsets, t_base, frequency, y_offset)
+            t_base += SAMPLES_PER_BATCH * TIME_STEP
+
+            for t, value in zip(timestamps.tolist(), values.tolist()):
+                data = {
+                    "stream_id": "sine_wave",
+                    "timestamp": t,
+                    "value": value
+                }
+                payload = orjson.dumps(data)
+                try:
+                    socket.send(payload, flags=zmq.NOBLOCK, copy=False, track=False)
+                except zmq.Again:
+                    pass  # The app isn't keeping up, skip this sample
+                next_send = sleep_until(next_send + SEND_PERIOD)
     except Exception as e:
         print(f"Error in stream_data: {e}", flush=True)
     finally:
@@ -47,6 +47,24 @@ def power_down(state):
     print("pass", flush=True)
     time.sleep(0.1)
 
+# Functions that can be run individually with --function
+HANDLERS = {
+    fn.__name__: fn
+    for fn in (
+        power_up,
+        run_jtag,
+        pogo_pin_circuit_1,
+        pogo_pin_circuit_2,
+        pogo_pin_circuit_3,
+        pogo_pin_circuit_4,
+        pogo_pin_circuit_5,
+        pogo_pin_circuit_6,
+        pogo_pin_circuit_7,
+        pogo_pin_circuit_8,
+        power_down,
+    )
+}
+
 if __name__ == "__main__":
     # Parse arguments to check for function-specific execution
     parser = argparse.ArgumentParser()
@@ -58,7 +76,8 @@ if __name__ == "__main__":
     
     if args.function:
         # Execute specific function if requested
-        if args.function in globals():
-            globals()[args.function](state)
+        handler = HANDLERS.get(args.function)
+        if handler:
+            handler(state)
         else:
             print(f"Error: Function '{args.function}' not found")
\ No newline at end of file
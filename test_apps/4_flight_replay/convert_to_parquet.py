@@ -0,0 +1,13 @@
+import os
+import polars as pl
+
+# One-off conversion of the flight log to Parquet, which flight_replay.py
+# scans instead of re-parsing the CSV on every run
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    csv_path = os.path.join(script_dir, "dji_ocean_flight_filtered.csv")
+    parquet_path = os.path.join(script_dir, "dji_ocean_flight_filtered.parquet")
+
+    pl.read_csv(csv_path).write_parquet(parquet_path, compression="zstd")
+    print(f"Wrote {parquet_path}")
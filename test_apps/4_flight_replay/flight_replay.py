@@ -10,80 +10,153 @@ LAT_LON_SCALE_FACTOR = 10_000  # Scale factor for lat/lon coordinates
 ALTITUDE_SCALE_FACTOR = 1 / 10  # Scale factor for altitude
 ALTITUDE_OFFSET = 1.0  # Offset for altitude
 
+# Decimal places kept for scaled values, so messages don't carry float noise
+LAT_LON_DECIMALS = 4  # 1e-8 degrees, about 1 mm of position
+ALTITUDE_DECIMALS = 2  # Matches the log's 0.1 ft height resolution
+TIMESTAMP_DECIMALS = 3  # Milliseconds, the log samples every ~0.1 s
+
+ROW_PERIOD = 0.01  # Seconds between streamed rows
+REPLAY_DELAY = 0.1  # Seconds between replays
+
+# Columns of the flight log that the replay streams
+REPLAY_COLUMNS = [
+    "timestamps_ns",
+    "OSD.latitude",
+    "OSD.longitude",
+    "OSD.height [ft]",
+    "OSD.pitch",
+    "OSD.roll",
+    "OSD.yaw",
+]
+
+
+def json_frames(df, stream_id, fields):
+    # Serialize one JSON frame per row, with `fields` mapping keys to expressions.
+    # Values are rendered with polars' float-to-string cast, so every field must
+    # be non-null and finite (see the filter in stream_data) to stay valid JSON
+    parts = []
+    separator = '{"stream_id":"%s",' % stream_id
+    for key, expr in fields.items():
+        parts += [pl.lit(f'{separator}"{key}":'), expr.cast(pl.Utf8)]
+        separator = ","
+    parts.append(pl.lit("}"))
+    payloads = df.select(pl.concat_str(parts)).to_series()
+    # Frames own their buffers, so every replay re-sends them without copying
+    return [zmq.Frame(payload.encode()) for payload in payloads.to_list()]
+
+
+def sleep_until(deadline):
+    # Sleep until a fixed-period deadline so send time does not accumulate as
+    # drift, restarting the schedule from now if it has already passed
+    delay = deadline - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+        return deadline
+    return time.perf_counter()
+
 
 def stream_data():
     print("Starting flight replay stream", flush=True)
 
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Construct the full path to the CSV file
+    # Construct the full paths to the flight log, and its optional Parquet copy
     csv_path = os.path.join(script_dir, "dji_ocean_flight_filtered.csv")
+    parquet_path = os.path.join(script_dir, "dji_ocean_flight_filtered.parquet")
 
     # Read initial app state from stdin
     app_state = json.loads(sys.stdin.read())
     print(f"Received initial app state: {app_state}", flush=True)
 
-    # Read the CSV file using the full path
-    df = pl.read_csv(csv_path)
-
-    # Calculate relative coordinates by subtracting the first position
-    initial_lat = df["OSD.latitude"][0]
-    initial_lon = df["OSD.longitude"][0]
+    # Prefer the Parquet copy written by convert_to_parquet.py, unless the CSV
+    # has changed since it was written
+    parquet_is_current = os.path.exists(parquet_path) and (
+        os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    )
+    if parquet_is_current:
+        flight_log = pl.scan_parquet(parquet_path)
+    else:
+        flight_log = pl.scan_csv(csv_path)
+
+    # Lazily scan the log so only the replayed columns are read, skip rows with
+    # missing or non-finite values, and calculate relative coordinates by
+    # subtracting the first position
+    df = (
+        flight_log.select(pl.col(REPLAY_COLUMNS).cast(pl.Float64))
+        .filter(pl.all_horizontal(pl.col(REPLAY_COLUMNS).is_finite()))
+        .with_columns(
+            [
+                (pl.col("OSD.latitude") - pl.col("OSD.latitude").first()).alias(
+                    "rel_lat"
+                ),
+                (pl.col("OSD.longitude") - pl.col("OSD.longitude").first()).alias(
+                    "rel_lon"
+                ),
+            ]
+        )
+        .collect()
+    )
 
-    # Calculate relative positions using polars expressions
-    df = df.with_columns(
-        [
-            (pl.col("OSD.latitude") - initial_lat).alias("rel_lat"),
-            (pl.col("OSD.longitude") - initial_lon).alias("rel_lon"),
-        ]
+    # Pre-serialize every message once so the send loop does no per-row work
+    # Despite its name, timestamps_ns holds epoch seconds; stream seconds since
+    # the start of the flight
+    timestamp = (pl.col("timestamps_ns") - pl.col("timestamps_ns").first()).round(
+        TIMESTAMP_DECIMALS
+    )
+    flight_frames = json_frames(
+        df,
+        "flight_position",
+        {
+            "timestamp": timestamp,
+            "rel_lat": (pl.col("rel_lat") * LAT_LON_SCALE_FACTOR).round(
+                LAT_LON_DECIMALS
+            ),
+            "rel_lon": (pl.col("rel_lon") * LAT_LON_SCALE_FACTOR).round(
+                LAT_LON_DECIMALS
+            ),
+            "altitude": (
+                pl.col("OSD.height [ft]") * ALTITUDE_SCALE_FACTOR + ALTITUDE_OFFSET
+            ).round(ALTITUDE_DECIMALS),
+            "pitch": pl.col("OSD.pitch"),
+            "roll": pl.col("OSD.roll"),
+            "yaw": pl.col("OSD.yaw"),
+        },
+    )
+    # Yaw data for 2D plot
+    yaw_frames = json_frames(
+        df,
+        "aircraft_pitch",
+        {"timestamp": timestamp, "value": pl.col("OSD.pitch")},
+    )
+    # Altitude data for 2D plot
+    altitude_frames = json_frames(
+        df,
+        "aircraft_altitude",
+        {"timestamp": timestamp, "value": pl.col("OSD.height [ft]")},
     )
 
     context = zmq.Context()
     socket = context.socket(zmq.PUSH)
+    socket.setsockopt(zmq.IMMEDIATE, 1)  # Only queue for connected peers
     print("Creating ZMQ PUSH socket...", flush=True)
     socket.bind("tcp://*:5555")
     print("Bound ZMQ socket to tcp://*:5555", flush=True)
 
     try:
+        next_send = time.perf_counter()
         while True:  # Add continuous loop
             # Stream each row of the dataframe
-            for row in df.iter_rows(named=True):
-                timestamp = float(row["timestamps_ns"]) / 1e9  # Convert ns to seconds
-
-                # Stream flight position data
-                flight_data = {
-                    "stream_id": "flight_position",
-                    "timestamp": timestamp,
-                    "rel_lat": float(row["rel_lat"]) * LAT_LON_SCALE_FACTOR,
-                    "rel_lon": float(row["rel_lon"]) * LAT_LON_SCALE_FACTOR,
-                    "altitude": (float(row["OSD.height [ft]"]) * ALTITUDE_SCALE_FACTOR)
-                    + ALTITUDE_OFFSET,
-                    "pitch": float(row["OSD.pitch"]),
-                    "roll": float(row["OSD.roll"]),
-                    "yaw": float(row["OSD.yaw"]),
-                }
-                socket.send_string(json.dumps(flight_data))
-
-                # Stream yaw data for 2D plot
-                yaw_data = {
-                    "stream_id": "aircraft_pitch",
-                    "timestamp": timestamp,
-                    "value": float(row["OSD.pitch"]),
-                }
-                socket.send_string(json.dumps(yaw_data))
-
-                # Stream altitude data for 2D plot
-                altitude_data = {
-                    "stream_id": "aircraft_altitude",
-                    "timestamp": timestamp,
-                    "value": float(row["OSD.height [ft]"]),
-                }
-                socket.send_string(json.dumps(altitude_data))
-
-                time.sleep(0.01)  # Add a small delay
+            for flight, yaw, altitude in zip(
+                flight_frames, yaw_frames, altitude_frames
+            ):
+                # One multipart message per row; the app reads each frame as its
+                # own stream message
+                socket.send_multipart([flight, yaw, altitude], copy=False)
+
+                next_send = sleep_until(next_send + ROW_PERIOD)
 
             # Optional: Add a small delay between replays
-            time.sleep(0.1)
+            next_send = sleep_until(next_send + REPLAY_DELAY)
 
     except Exception as e:
         print(f"Error in stream_data: {e}", flush=True)